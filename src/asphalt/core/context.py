@@ -19,7 +19,6 @@ __all__ = (
 )
 
 import logging
-import re
 import sys
 import types
 import warnings
@@ -35,7 +34,6 @@ from collections.abc import Coroutine
 from collections.abc import Sequence as ABCSequence
 from concurrent.futures import Executor
 from contextvars import ContextVar, Token, copy_context
-from dataclasses import dataclass, field
 from enum import Enum, auto
 from functools import partial, wraps
 from inspect import (
@@ -57,8 +55,6 @@ from typing import (
     TypeVar,
     Union,
     cast,
-    get_args,
-    get_origin,
     get_type_hints,
     overload,
 )
@@ -69,6 +65,11 @@ from async_generator import async_generator
 from .event import Event, Signal, wait_event
 from .utils import callable_name, qualified_name
 
+if sys.version_info >= (3, 9):
+    from typing import Annotated, get_args, get_origin
+else:
+    from typing_extensions import Annotated, get_args, get_origin
+
 if sys.version_info >= (3, 10):
     from typing import ParamSpec
 else:
@@ -77,7 +78,6 @@ else:
 
 logger = logging.getLogger(__name__)
 factory_callback_type = Callable[["Context"], Any]
-resource_name_re = re.compile(r"\w+")
 T_Resource = TypeVar("T_Resource")
 T_Retval = TypeVar("T_Retval")
 T_Context = TypeVar("T_Context", bound="Context")
@@ -86,6 +86,12 @@ P = ParamSpec("P")
 _current_context: ContextVar[Context | None] = ContextVar(
     "_current_context", default=None
 )
+_get_current_context = _current_context.get
+
+
+def _is_valid_resource_name(name: str) -> bool:
+    # Same as matching against r"\w+", but without allocating a match object
+    return isinstance(name, str) and name.replace("_", "a").isalnum()
 
 
 class ResourceContainer:
@@ -120,11 +126,13 @@ class ResourceContainer:
         assert self.is_factory, "generate_value() only works for resource factories"
         value = self.value_or_factory(ctx)
 
-        container = ResourceContainer(
-            value, self.types, self.name, self.context_attr, False
-        )
-        for type_ in self.types:
-            ctx._resources[(type_, self.name)] = container
+        types, name = self.types, self.name
+        container = ResourceContainer(value, types, name, self.context_attr, False)
+        if len(types) == 1:
+            ctx._resources.setdefault(types[0], {})[name] = container
+        else:
+            for type_ in types:
+                ctx._resources.setdefault(type_, {})[name] = container
 
         if self.context_attr:
             setattr(ctx, self.context_attr, value)
@@ -134,9 +142,9 @@ class ResourceContainer:
     def __repr__(self) -> str:
         typenames = ", ".join(qualified_name(cls) for cls in self.types)
         value_repr = (
-            "factory=%s" % callable_name(self.value_or_factory)
+            f"factory={callable_name(self.value_or_factory)}"
             if self.is_factory
-            else "value=%r" % self.value_or_factory
+            else f"value={self.value_or_factory!r}"
         )
         return (
             f"{self.__class__.__name__}({value_repr}, types=[{typenames}], name={self.name!r}, "
@@ -251,7 +259,7 @@ class Context:
 
     def __init__(self, parent: Context | None = None) -> None:
         if parent is None:
-            self._parent = _current_context.get(None)
+            self._parent = _get_current_context()
         else:
             warnings.warn(
                 "Explicitly passing the parent context has been deprecated. "
@@ -262,21 +270,29 @@ class Context:
             )
             self._parent = parent
 
+        # The parent can't be changed afterwards, so the ancestry can be computed once
+        self._ancestors: tuple[Context, ...] = (
+            (self._parent, *self._parent._ancestors) if self._parent is not None else ()
+        )
         self._state = ContextState.open
-        self._resources: dict[tuple[type, str], ResourceContainer] = {}
-        self._resource_factories: dict[tuple[type, str], ResourceContainer] = {}
+        self._resources: dict[type, dict[str, ResourceContainer]] = {}
+        self._resource_factories: dict[type, dict[str, ResourceContainer]] = {}
         self._resource_factories_by_context_attr: dict[str, ResourceContainer] = {}
         self._teardown_callbacks: list[tuple[Callable, bool]] = []
 
     def __getattr__(self, name):
         # First look for a resource factory in the whole context chain
-        for ctx in self.context_chain:
+        factory = self._resource_factories_by_context_attr.get(name)
+        if factory:
+            return factory.generate_value(self)
+
+        for ctx in self._ancestors:
             factory = ctx._resource_factories_by_context_attr.get(name)
             if factory:
                 return factory.generate_value(self)
 
         # When that fails, look directly for an attribute in the parents
-        for ctx in self.context_chain[1:]:
+        for ctx in self._ancestors:
             value = getattr_static(ctx, name, None)
             if value is not None:
                 return getattr(ctx, name)
@@ -286,21 +302,16 @@ class Context:
     @property
     def context_chain(self) -> list[Context]:
         """Return a list of contexts starting from this one, its parent and so on."""
-        contexts = []
-        ctx: Context | None = self
-        while ctx is not None:
-            contexts.append(ctx)
-            ctx = ctx.parent
-
-        return contexts
+        return [self, *self._ancestors]
 
     @property
     def loop(self) -> AbstractEventLoop:
         """Return the event loop associated with this context."""
-        if self._loop is None:
-            self._loop = get_running_loop()
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = get_running_loop()
 
-        return self._loop
+        return loop
 
     @property
     def parent(self) -> Context | None:
@@ -368,10 +379,11 @@ class Context:
             exceptions = []
             while self._teardown_callbacks:
                 callbacks, self._teardown_callbacks = self._teardown_callbacks, []
-                for callback, pass_exception in reversed(callbacks):
+                while callbacks:
+                    callback, pass_exception = callbacks.pop()
                     try:
                         retval = callback(exception) if pass_exception else callback()
-                        if isawaitable(retval):
+                        if retval is not None and isawaitable(retval):
                             await retval
                     except Exception as e:
                         exceptions.append(e)
@@ -451,22 +463,25 @@ class Context:
 
         """
         self._check_closed()
-        if types:
+        resource_types: tuple[type, ...]
+        if not types:
+            resource_types = (type(value),)
+        else:
             if (
                 isclass(types)
                 or get_origin(types) is not None
                 or not isinstance(types, ABCSequence)
             ):
-                types = (cast(type, types),)
+                resource_types = (cast(type, types),)
+            else:
+                resource_types = tuple(types)
 
-            if not all(isclass(x) or get_origin(x) is not None for x in types):
+            if not all(isclass(x) or get_origin(x) is not None for x in resource_types):
                 raise TypeError("types must be a type or sequence of types")
-        else:
-            types = (type(value),)
 
         if value is None:
             raise ValueError('"value" must not be None')
-        if not resource_name_re.fullmatch(name):
+        if not _is_valid_resource_name(name):
             raise ValueError(
                 '"name" must be a nonempty string consisting only of alphanumeric '
                 "characters and underscores"
@@ -476,16 +491,16 @@ class Context:
                 f"this context already has an attribute {context_attr!r}"
             )
 
-        for resource_type in types:
-            if (resource_type, name) in self._resources:
+        for resource_type in resource_types:
+            if name in self._resources.get(resource_type, ()):
                 raise ResourceConflict(
                     f"this context already contains a resource of type "
                     f"{qualified_name(resource_type)} using the name {name!r}"
                 )
 
-        resource = ResourceContainer(value, tuple(types), name, context_attr, False)
-        for type_ in resource.types:
-            self._resources[(type_, name)] = resource
+        resource = ResourceContainer(value, resource_types, name, context_attr, False)
+        for type_ in resource_types:
+            self._resources.setdefault(type_, {})[name] = resource
 
         if context_attr:
             warnings.warn(
@@ -497,7 +512,7 @@ class Context:
             setattr(self, context_attr, value)
 
         # Notify listeners that a new resource has been made available
-        self.resource_added.dispatch(types, name, False)
+        self.resource_added.dispatch(resource_types, name, False)
 
     def add_resource_factory(
         self,
@@ -539,7 +554,7 @@ class Context:
         import types as stdlib_types
 
         self._check_closed()
-        if not resource_name_re.fullmatch(name):
+        if not _is_valid_resource_name(name):
             raise ValueError(
                 '"name" must be a nonempty string consisting only of alphanumeric '
                 "characters and underscores"
@@ -586,7 +601,7 @@ class Context:
 
         # Check for conflicts with existing resource factories
         for type_ in resource_types:
-            if (type_, name) in self._resource_factories:
+            if name in self._resource_factories.get(type_, ()):
                 raise ResourceConflict(
                     "this context already contains a resource factory for the "
                     f"type {qualified_name(type_)}"
@@ -597,7 +612,7 @@ class Context:
             factory_callback, resource_types, name, context_attr, True
         )
         for type_ in resource_types:
-            self._resource_factories[(type_, name)] = resource
+            self._resource_factories.setdefault(type_, {})[name] = resource
 
         if context_attr:
             warnings.warn(
@@ -623,75 +638,56 @@ class Context:
 
         """
         self._check_closed()
-        key = (type, name)
 
         # First check if there's already a matching resource in this context
-        resource = self._resources.get(key)
-        if resource is not None:
-            return resource.value_or_factory
+        resources = self._resources.get(type)
+        if resources:
+            resource = resources.get(name)
+            if resource is not None:
+                return resource.value_or_factory
 
         # Next, check if there's a resource factory available on the context chain
-        resource = next(
-            (
-                ctx._resource_factories[key]
-                for ctx in self.context_chain
-                if key in ctx._resource_factories
-            ),
-            None,
-        )
-        if resource is not None:
-            return resource.generate_value(self)
+        factories = self._resource_factories.get(type)
+        if factories:
+            resource = factories.get(name)
+            if resource is not None:
+                return resource.generate_value(self)
+
+        for ctx in self._ancestors:
+            factories = ctx._resource_factories.get(type)
+            if factories:
+                resource = factories.get(name)
+                if resource is not None:
+                    return resource.generate_value(self)
 
         # Finally, check parents for a matching resource
-        return next(
-            (
-                ctx._resources[key].value_or_factory
-                for ctx in self.context_chain
-                if key in ctx._resources
-            ),
-            None,
-        )
+        for ctx in self._ancestors:
+            resources = ctx._resources.get(type)
+            if resources:
+                resource = resources.get(name)
+                if resource is not None:
+                    return resource.value_or_factory
+
+        return None
 
     def get_resources(self, type: type[T_Resource]) -> set[T_Resource]:
         """
         Retrieve all the resources of the given type in this context and its parents.
 
-        Any matching resource factories are also triggered if necessary.
+        Resource factories are not triggered by this method; only resources that have
+        already been added or generated are returned.
 
         :param type: type of the resources to get
         :return: a set of all found resources of the given type
 
         """
-        # Collect all the matching resources from this context
-        resources: dict[str, T_Resource] = {
-            container.name: container.value_or_factory
-            for container in self._resources.values()
-            if not container.is_factory and type in container.types
-        }
-
-        # Next, find all matching resource factories in the context chain and generate resources
-        resources.update(
-            {
-                container.name: container.generate_value(self)
-                for ctx in self.context_chain
-                for container in ctx._resources.values()
-                if container.is_factory
-                and type in container.types
-                and container.name not in resources
-            }
-        )
-
-        # Finally, add the resource values from the parent contexts
-        resources.update(
-            {
-                container.name: container.value_or_factory
-                for ctx in self.context_chain[1:]
-                for container in ctx._resources.values()
-                if not container.is_factory
-                and type in container.types
-                and container.name not in resources
-            }
-        )
+        # Collect the matching resources, letting the closest context win on name clashes
+        resources: dict[str, T_Resource] = {}
+        for ctx in self.context_chain:
+            containers = ctx._resources.get(type)
+            if containers:
+                for container in containers.values():
+                    resources.setdefault(container.name, container.value_or_factory)
 
         return set(resources.values())
 
@@ -784,11 +780,15 @@ class Context:
             executor = self.require_resource(Executor, executor)
 
         # Fill in self._loop if it's None
-        if self._loop is None:
-            self._loop = get_running_loop()
+        loop = self._loop
+        if loop is None:
+            loop = self._loop = get_running_loop()
+
+        if not kwargs:
+            return loop.run_in_executor(executor, copy_context().run, func, *args)
 
         callback: partial[T_Retval] = partial(copy_context().run, func, *args, **kwargs)
-        return self._loop.run_in_executor(executor, callback)
+        return loop.run_in_executor(executor, callback)
 
     def threadpool(self, executor: Executor | str | None = None):
         """
@@ -961,7 +961,7 @@ def current_context() -> Context:
     :raises NoCurrentContext: if there is no active context
 
     """
-    ctx = _current_context.get()
+    ctx = _get_current_context()
     if ctx is None:
         raise NoCurrentContext
 
@@ -983,11 +983,14 @@ def require_resource(type: type[T_Resource], name: str = "default") -> T_Resourc
     return current_context().require_resource(type, name)
 
 
-@dataclass
 class _Dependency:
-    name: str = "default"
-    cls: type = field(init=False)
-    optional: bool = field(init=False, default=False)
+    __slots__ = ("name",)
+
+    def __init__(self, name: str = "default") -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r})"
 
     def __getattr__(self, item):
         raise AttributeError(
@@ -1035,39 +1038,50 @@ def inject(func: Callable[P, Any]) -> Callable[P, Any]:
     default value. When the wrapped function is called, values for such parameters will
     be automatically filled in by calling :func:`require_resource` using the parameter's
     type annotation and the resource name passed to :func:`resource` (or ``"default"``)
-    as the arguments.
+    as the arguments. Values explicitly passed as keyword arguments for such parameters
+    take precedence over injection.
 
     Any forward references among the type annotations are resolved on the first call to
     the wrapped function.
 
     """
     forward_refs_resolved = False
+    injection_plan: tuple[tuple[str, type, str, bool], ...] = ()
     local_names = sys._getframe(1).f_locals if "<locals>" in func.__qualname__ else {}
 
     def resolve_forward_refs() -> None:
-        nonlocal forward_refs_resolved, local_names
+        nonlocal forward_refs_resolved, injection_plan, local_names
         type_hints = get_type_hints(func, localns=local_names)
-        for key, dependency in injected_resources.items():
-            dependency.cls = type_hints[key]
-            origin = get_origin(type_hints[key])
+        plan: list[tuple[str, type, str, bool]] = []
+        for argname, dependency in injected_resources.items():
+            cls = type_hints[argname]
+            if get_origin(cls) is Annotated:
+                cls = get_args(cls)[0]
+
+            optional = False
+            origin = get_origin(cls)
             if origin is Union or (
                 sys.version_info >= (3, 10) and origin is types.UnionType  # noqa: E721
             ):
                 args = [
-                    arg
-                    for arg in get_args(dependency.cls)
-                    if arg is not type(None)  # noqa: E721
+                    arg for arg in get_args(cls) if arg is not type(None)  # noqa: E721
                 ]
                 if len(args) == 1:
-                    dependency.optional = True
-                    dependency.cls = args[0]
+                    optional = True
+                    cls = args[0]
+                    if get_origin(cls) is Annotated:
+                        cls = get_args(cls)[0]
                 else:
                     raise TypeError(
                         "Unions are only valid with dependency injection when there "
                         "are exactly two items and other item is None"
                     )
 
+            # The markers may be shared between functions, so they must not be modified
+            plan.append((argname, cls, dependency.name, optional))
+
         del local_names
+        injection_plan = tuple(plan)
         forward_refs_resolved = True
 
     @wraps(func)
@@ -1076,16 +1090,14 @@ def inject(func: Callable[P, Any]) -> Callable[P, Any]:
             resolve_forward_refs()
 
         ctx = current_context()
-        resources: dict[str, Any] = {}
-        for argname, dependency in injected_resources.items():
-            if dependency.optional:
-                resource = ctx.get_resource(dependency.cls, dependency.name)
-            else:
-                resource = ctx.require_resource(dependency.cls, dependency.name)
-
-            resources[argname] = resource
+        for argname, cls, name, optional in injection_plan:
+            if argname not in kwargs:
+                if optional:
+                    kwargs[argname] = ctx.get_resource(cls, name)
+                else:
+                    kwargs[argname] = ctx.require_resource(cls, name)
 
-        return func(*args, **kwargs, **resources)
+        return func(*args, **kwargs)
 
     @wraps(func)
     async def async_wrapper(*args, **kwargs) -> Any:
@@ -1093,21 +1105,19 @@ def inject(func: Callable[P, Any]) -> Callable[P, Any]:
             resolve_forward_refs()
 
         ctx = current_context()
-        resources: dict[str, Any] = {}
-        for argname, dependency in injected_resources.items():
-            if dependency.optional:
-                resource = ctx.get_resource(dependency.cls, dependency.name)
-            else:
-                resource = ctx.require_resource(dependency.cls, dependency.name)
-
-            resources[argname] = resource
+        for argname, cls, name, optional in injection_plan:
+            if argname not in kwargs:
+                if optional:
+                    kwargs[argname] = ctx.get_resource(cls, name)
+                else:
+                    kwargs[argname] = ctx.require_resource(cls, name)
 
-        return await func(*args, **kwargs, **resources)
+        return await func(*args, **kwargs)
 
     sig = signature(func)
     injected_resources: dict[str, _Dependency] = {}
     for param in sig.parameters.values():
-        if isinstance(param.default, _Dependency):
+        if type(param.default) is _Dependency:
             if param.kind is Parameter.POSITIONAL_ONLY:
                 raise TypeError(
                     f"Cannot inject dependency to positional-only parameter "
@@ -31,6 +31,11 @@ from asphalt.core import (
 )
 from asphalt.core.context import ResourceContainer, require_resource
 
+if sys.version_info >= (3, 9):
+    from typing import Annotated
+else:
+    from typing_extensions import Annotated
+
 
 @pytest.fixture
 def context() -> Context:
@@ -93,6 +98,15 @@ class TestContext:
                 assert parent.parent is None
                 assert child.parent is parent
 
+    @pytest.mark.asyncio
+    async def test_context_chain(self) -> None:
+        """Test that the context chain starts from the context itself and ends at the root."""
+        async with Context() as parent:
+            async with Context() as child:
+                async with Context() as grandchild:
+                    assert parent.context_chain == [parent]
+                    assert grandchild.context_chain == [grandchild, child, parent]
+
     @pytest.mark.parametrize(
         "exception", [None, Exception("foo")], ids=["noexception", "exception"]
     )
@@ -195,7 +209,9 @@ class TestContext:
         close.assert_called_once_with(exception)
         assert exc.value is exception
 
-    @pytest.mark.parametrize("types", [int, (int,), ()], ids=["type", "tuple", "empty"])
+    @pytest.mark.parametrize(
+        "types", [int, (int,), [int], ()], ids=["type", "tuple", "list", "empty"]
+    )
     @pytest.mark.asyncio
     async def test_add_resource(self, context, event_loop, types):
         """Test that a resource is properly added in the context and listeners are notified."""
@@ -256,7 +272,7 @@ class TestContext:
         )
 
     @pytest.mark.parametrize(
-        "name", ["a.b", "a:b", "a b"], ids=["dot", "colon", "space"]
+        "name", ["", "a.b", "a:b", "a b"], ids=["empty", "dot", "colon", "space"]
     )
     @pytest.mark.asyncio
     async def test_add_resource_bad_name(self, context, name):
@@ -311,7 +327,7 @@ class TestContext:
         assert context.get_resource(dict) is None
 
     @pytest.mark.parametrize(
-        "name", ["a.b", "a:b", "a b"], ids=["dot", "colon", "space"]
+        "name", ["", "a.b", "a:b", "a b"], ids=["empty", "dot", "colon", "space"]
     )
     @pytest.mark.asyncio
     async def test_add_resource_factory_bad_name(self, context, name):
@@ -445,6 +461,15 @@ class TestContext:
             subctx.add_resource(4, "foo")
             assert subctx.get_resources(int) == {1, 4}
 
+    @pytest.mark.asyncio
+    async def test_get_resources_closest_parent(self, context: Context) -> None:
+        """Test that a parent's resource shadows one with the same name further up."""
+        context.add_resource(1, "foo")
+        async with context, Context() as subctx:
+            subctx.add_resource(2, "foo")
+            async with Context() as subsubctx:
+                assert subsubctx.get_resources(int) == {2}
+
     @pytest.mark.asyncio
     async def test_require_resource(self, context: Context) -> None:
         context.add_resource(1)
@@ -522,6 +547,16 @@ class TestContext:
         worker_thread = await context.call_in_executor(current_thread)
         assert worker_thread is not current_thread()
 
+    @pytest.mark.asyncio
+    async def test_call_in_executor_arguments(self, context: Context) -> None:
+        """Test that call_in_executor passes both positional and keyword arguments."""
+
+        def func(x: int, y: int) -> tuple[int, int]:
+            return x, y
+
+        assert await context.call_in_executor(func, 1, 2) == (1, 2)
+        assert await context.call_in_executor(func, 1, y=2) == (1, 2)
+
     @pytest.mark.parametrize(
         "use_resource_name", [True, False], ids=["direct", "resource"]
     )
@@ -886,6 +921,38 @@ class TestDependencyInjection:
             f".injected' is missing the type annotation"
         )
 
+    @pytest.mark.parametrize(
+        "sync",
+        [
+            pytest.param(True, id="sync"),
+            pytest.param(False, id="async"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_explicit_keyword_argument(self, sync: bool) -> None:
+        if sync:
+
+            @inject
+            def injected(
+                bar: str = resource(), *, baz: str = resource("alt")
+            ) -> Tuple[str, str]:  # noqa: UP006
+                return bar, baz
+
+        else:
+
+            @inject
+            async def injected(
+                bar: str = resource(), *, baz: str = resource("alt")
+            ) -> Tuple[str, str]:  # noqa: UP006
+                return bar, baz
+
+        async with Context() as ctx:
+            ctx.add_resource("bar_test")
+            retval = (
+                injected(baz="explicit") if sync else (await injected(baz="explicit"))
+            )
+            assert retval == ("bar_test", "explicit")
+
     @pytest.mark.asyncio
     async def test_missing_resource(self) -> None:
         @inject
@@ -948,6 +1015,44 @@ class TestDependencyInjection:
             retval = injected() if sync else (await injected())
             assert retval == "hello"
 
+    @pytest.mark.asyncio
+    async def test_shared_marker(self) -> None:
+        """Test that a resource() marker can be shared between differently typed parameters."""
+        marker = resource()
+
+        @inject
+        async def injected_str(res: str = marker) -> str:
+            return res
+
+        @inject
+        async def injected_int(res: int = marker) -> int:
+            return res
+
+        async with Context() as ctx:
+            ctx.add_resource("hello")
+            ctx.add_resource(5)
+            assert await injected_str() == "hello"
+            assert await injected_int() == 5
+            assert await injected_str() == "hello"
+
+    @pytest.mark.asyncio
+    async def test_annotated(self) -> None:
+        """Test that Annotated type hints are unwrapped to the underlying resource type."""
+
+        @inject
+        async def injected(
+            res: Annotated[str, "tag"] = resource(),
+            opt_res: Optional[Annotated[int, "tag"]] = resource(),  # noqa: UP007
+            opt_res2: Annotated[Optional[int], "tag"] = resource(),  # noqa: UP007
+        ) -> Tuple[str, Optional[int], Optional[int]]:  # noqa: UP006, UP007
+            return res, opt_res, opt_res2
+
+        async with Context() as ctx:
+            ctx.add_resource("hello")
+            assert await injected() == ("hello", None, None)
+            ctx.add_resource(5)
+            assert await injected() == ("hello", 5, 5)
+
     def test_resource_function_not_called(self) -> None:
         async def injected(foo: int, bar: str = resource) -> None:
             pass